@@ -6,18 +6,36 @@ def calculateMaxDD(cumRet):
 # cumulative COMPOUNDED returns. cumRet must be a compounded cumulative return.
 # i is the index of the day with maxDD.
 # =============================================================================
-    highwatermark=np.zeros(cumRet.shape)
-    drawdown=np.zeros(cumRet.shape)
-    drawdownduration=np.zeros(cumRet.shape)
-    
-    for t in np.arange(1, cumRet.shape[0]):
-        highwatermark[t]=np.maximum(highwatermark[t-1], cumRet[t])
-        drawdown[t]=(1+cumRet[t])/(1+highwatermark[t])-1
-        if drawdown[t]==0:
-            drawdownduration[t]=0
-        else:
-            drawdownduration[t]=drawdownduration[t-1]+1
-             
-    maxDD, i=np.min(drawdown), np.argmin(drawdown) # drawdown < 0 always
-    maxDDD=np.max(drawdownduration)
-    return maxDD, maxDDD, i
\ No newline at end of file
+    cumRet=np.asarray(cumRet, dtype=float)
+
+    # highwatermark starts at 0 on day 0, i.e. the initial capital
+    highwatermark=np.maximum.accumulate(np.concatenate(([0.0], cumRet[1:])))
+    drawdown=(1.0+cumRet)/(1.0+highwatermark)-1.0
+    drawdown[0]=0.0
+
+    return _maxDD(drawdown)
+
+def calculateMaxDDLog(cumLogRet):
+# =============================================================================
+# same as calculateMaxDD, but based on cumulative LOG returns
+# cumLogRet = cumsum(log1p(ret)). The drawdown is then a difference against
+# the highwatermark instead of a ratio.
+# =============================================================================
+    cumLogRet=np.asarray(cumLogRet, dtype=float)
+
+    highwatermark=np.maximum.accumulate(np.concatenate(([0.0], cumLogRet[1:])))
+    drawdown=np.expm1(cumLogRet-highwatermark)
+    drawdown[0]=0.0
+    return _maxDD(drawdown)
+
+def _maxDD(drawdown):
+    idx=np.arange(drawdown.shape[0])
+
+    # duration restarts from 0 whenever a new highwatermark is reached: the
+    # index of the last day with drawdown==0 is a running max, no branches
+    reset=np.where(drawdown==0, idx, 0)
+    drawdownduration=idx-np.maximum.accumulate(reset)
+
+    maxDD, i=drawdown.min(), int(drawdown.argmin()) # drawdown < 0 always
+    maxDDD=float(drawdownduration.max())
+    return maxDD, maxDDD, i
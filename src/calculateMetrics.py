@@ -0,0 +1,34 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    import bottleneck as bn
+    _nanmean, _nanstd = bn.nanmean, bn.nanstd
+except ImportError:  # bottleneck is optional
+    _nanmean, _nanstd = np.nanmean, np.nanstd
+
+from .calculateMaxDD import calculateMaxDDLog
+
+Metrics=namedtuple("Metrics", ["cumRet", "avgRet", "avgStdRet", "sharpe", "maxDD", "maxDDD", "i"])
+
+def calculateMetrics(ret, tradingDays=252, rf=0.0):
+# =============================================================================
+# backtest metrics from daily returns ret. log1p(ret) is computed once and
+# used for both the compounded cumulative return and the drawdown.
+# rf is the annualized risk-free rate used in the Sharpe ratio.
+# returns a Metrics namedtuple: cumRet, annualized return, annualized
+# volatility, Sharpe ratio, maxDD, maxDDD and i (see calculateMaxDD).
+# =============================================================================
+    ret=np.asarray(ret, dtype=float)
+
+    cumLogRet=np.cumsum(np.log1p(ret))
+    cumRet=np.expm1(cumLogRet)
+
+    avgRet=_nanmean(ret)*tradingDays
+    avgStdRet=_nanstd(ret)*math.sqrt(tradingDays)
+    sharpe=(avgRet-rf)/avgStdRet
+
+    maxDD, maxDDD, i=calculateMaxDDLog(cumLogRet)
+    return Metrics(cumRet, avgRet, avgStdRet, sharpe, maxDD, maxDDD, i)
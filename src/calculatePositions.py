@@ -0,0 +1,144 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, fall back to plain Python loops
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
+@njit(parallel=True, cache=True)
+def _pcaPositions(R_all, nanCount, lookback, numFactors, topN, positionsTable, expRetTable):
+    T, A = R_all.shape
+    for t in prange(lookback + 1, T):
+        # training window: the lookback days before t, stocks with any NaN are dropped.
+        # nanCount[t] counts the NaNs in rows [0, t), so this is O(A) per day
+        hasData = np.where(nanCount[t] - nanCount[t - lookback] == 0)[0]
+        n = hasData.shape[0]
+        if n == 0:
+            continue
+        # a row block of R_all is already a contiguous view, only gather the
+        # columns when some stocks have to be dropped
+        if n == A:
+            Y = R_all[t - lookback:t]
+        else:
+            Y = np.ascontiguousarray(R_all[t - lookback:t][:, hasData])
+
+        # PCA: keep the first numFactors principal components of the demeaned
+        # returns Z. Decompose whichever of Z.T @ Z (n x n) and Z @ Z.T
+        # (lookback x lookback) is smaller; both give the same scores Z @ V
+        Z = Y - Y.sum(axis=0) / lookback
+        k = min(numFactors, n, lookback)
+        # first column of X is the constant term
+        X = np.ones((lookback, k + 1))
+        if lookback >= n:
+            eigvals, eigvecs = np.linalg.eigh(Z.T @ Z)  # ascending eigenvalues
+            V = np.ascontiguousarray(eigvecs[:, ::-1][:, :k])
+            X[:, 1:] = Z @ V
+        else:
+            # Z = U S V.T, so the scores Z @ V are U * S with S**2 the eigenvalues of Z @ Z.T
+            eigvals, eigvecs = np.linalg.eigh(Z @ Z.T)
+            for j in range(k):
+                X[:, j + 1] = eigvecs[:, -1 - j] * np.sqrt(max(eigvals[-1 - j], 0.0))
+
+        # Y = X W + e for all stocks at once. The PCA scores are demeaned and
+        # mutually orthogonal, so X.T @ X is diagonal and the OLS solve reduces
+        # to dividing X.T @ Y by its diagonal (columns with zero variance get 0)
+        xx = (X * X).sum(axis=0)
+        W = X.T @ Y
+        for j in range(k + 1):
+            if xx[j] > 0:
+                W[j] /= xx[j]
+            else:
+                W[j] = 0.0
+        avgExpRet = (X @ W).sum(axis=0) / lookback
+        expRetTable[t, hasData] = avgExpRet
+
+        # only the topN lowest and highest are needed, and positions are equal
+        # weight, so partition instead of a full sort (ties at the cutoff may
+        # be broken differently than by argsort)
+        m = min(topN, n)
+        if m > 0:
+            positionsTable[t, hasData[np.argpartition(avgExpRet, m - 1)[:m]]] = -1
+            positionsTable[t, hasData[np.argpartition(avgExpRet, n - m)[n - m:]]] = 1
+
+
+def _pcaPositionsBatched(xp, R_all, nanCount, lookback, numFactors, topN, positionsTable, expRetTable, batchSize):
+    # same model as _pcaPositions, but batchSize days at a time with batched
+    # matmul/eigh in the array module xp (cupy on the GPU). Instead of dropping
+    # the stocks without full data they are zeroed, which leaves the PCA scores
+    # and the regressions of the other stocks unchanged.
+    toHost = getattr(xp, "asnumpy", np.asarray)
+    T, A = R_all.shape
+    k = min(numFactors, lookback, A)
+    m = min(topN, A)
+    R_dev = xp.asarray(np.where(np.isnan(R_all), 0.0, R_all))
+    nanCount_dev = xp.asarray(nanCount)
+    offsets = xp.arange(lookback)
+    j = xp.arange(m)
+
+    for t0 in range(lookback + 1, T, batchSize):
+        t1 = min(t0 + batchSize, T)
+        t = xp.arange(t0, t1)
+        B = t1 - t0
+        hasData = nanCount_dev[t] - nanCount_dev[t - lookback] == 0   # B x A
+        n = hasData.sum(axis=1)
+        Y = R_dev[(t - lookback)[:, None] + offsets] * hasData[:, None, :]   # B x lookback x A
+
+        Z = Y - Y.mean(axis=1, keepdims=True)
+        X = xp.ones((B, lookback, k + 1))
+        if lookback >= A:
+            eigvals, eigvecs = xp.linalg.eigh(xp.matmul(Z.transpose(0, 2, 1), Z))
+            X[:, :, 1:] = xp.matmul(Z, eigvecs[:, :, ::-1][:, :, :k])
+        else:
+            eigvals, eigvecs = xp.linalg.eigh(xp.matmul(Z, Z.transpose(0, 2, 1)))
+            X[:, :, 1:] = eigvecs[:, :, ::-1][:, :, :k] * xp.sqrt(xp.maximum(eigvals[:, None, ::-1][:, :, :k], 0.0))
+        # k is batch-wide, but Z has rank at most min(n, lookback - 1) on each
+        # day. Components beyond that are numerical noise (in the Gram branch
+        # not even demeaned), so zero them like the per-day k of _pcaPositions
+        X[:, :, 1:] *= (xp.arange(k) < xp.minimum(n, lookback - 1)[:, None])[:, None, :]
+
+        xx = (X * X).sum(axis=1)
+        W = xp.matmul(X.transpose(0, 2, 1), Y) / xp.where(xx > 0, xx, xp.inf)[:, :, None]
+        avgExpRet = xp.matmul(X.sum(axis=1)[:, None, :], W)[:, 0, :] / lookback   # B x A
+
+        # rank on the device, stocks without data sort last; only the topN
+        # indices per day and the expected returns are copied back
+        idxSort = xp.argsort(xp.where(hasData, avgExpRet, xp.inf), axis=1)
+        shortIdx = idxSort[:, :m]
+        longPos = n[:, None] - m + j
+        longIdx = xp.take_along_axis(idxSort, xp.maximum(longPos, 0), axis=1)
+
+        n, shortIdx, longPos, longIdx = toHost(n), toHost(shortIdx), toHost(longPos), toHost(longIdx)
+        expRetTable[t0:t1] = toHost(xp.where(hasData, avgExpRet, 0.0))
+        rows = np.broadcast_to(np.arange(t0, t1)[:, None], shortIdx.shape)
+        sel = np.arange(m) < n[:, None]
+        positionsTable[rows[sel], shortIdx[sel]] = -1
+        sel = longPos >= 0
+        positionsTable[rows[sel], longIdx[sel]] = 1
+
+
+def calculatePositions(dailyRet, lookback, numFactors, topN, gpu=False, batchSize=64):
+# =============================================================================
+# PCA factor trend strategy. For each day t from lookback+1 on, fit the factor
+# model on the previous lookback days of returns, short the topN stocks with
+# the lowest predicted return and long the topN with the highest.
+# dailyRet is a (days x stocks) DataFrame or array of daily returns.
+# gpu=True runs batchSize days at a time on the GPU with cupy (needs cupy),
+# which pays off for wide universes.
+# Returns positionsTable (int8: -1 short, 1 long, 0 flat) and expRetTable,
+# both (days x stocks) arrays.
+# =============================================================================
+    R_all = np.ascontiguousarray(np.asarray(dailyRet, dtype=np.float64))
+    nanCount = np.zeros((R_all.shape[0] + 1, R_all.shape[1]), dtype=np.int32)
+    np.cumsum(np.isnan(R_all), axis=0, out=nanCount[1:])
+    positionsTable = np.zeros(R_all.shape, dtype=np.int8)
+    expRetTable = np.zeros(R_all.shape)
+    if gpu:
+        import cupy
+        _pcaPositionsBatched(cupy, R_all, nanCount, lookback, numFactors, topN, positionsTable, expRetTable, batchSize)
+    else:
+        _pcaPositions(R_all, nanCount, lookback, numFactors, topN, positionsTable, expRetTable)
+    return positionsTable, expRetTable
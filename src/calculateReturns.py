@@ -0,0 +1,22 @@
+import numpy as np
+
+def calculateReturns(positionsTable, dailyRet):
+# =============================================================================
+# daily strategy returns without transaction costs. capital is the sum of the
+# absolute positions of each day, ret = sum(positions * returns) / capital and
+# 0 on days without any position. NaN returns count as 0 (as in np.nansum).
+# positionsTable and dailyRet are (days x stocks) arrays or DataFrames.
+# =============================================================================
+    P=np.asarray(positionsTable)
+    R=np.asarray(dailyRet, dtype=float)
+
+    capital=np.abs(P).sum(axis=1, dtype=float)
+    # multiply and sum per day in one pass, without a (days x stocks) product;
+    # only the days with a NaN return somewhere are redone with np.nansum
+    num=np.einsum('ta,ta->t', P, R)
+    bad=np.isnan(num)
+    num[bad]=np.nansum(P[bad]*R[bad], axis=1)
+
+    ret=np.zeros(P.shape[0])
+    np.divide(num, capital, out=ret, where=capital>0)
+    return ret
@@ -0,0 +1,14 @@
+import pandas as pd
+
+def readCsv(path, **kwargs):
+# =============================================================================
+# pd.read_csv with the multithreaded pyarrow parser when pyarrow is installed,
+# otherwise the default C parser. The C parser is also used for read_csv
+# options the pyarrow engine rejects (nrows, low_memory, skipfooter, ...).
+# Numeric columns are float64 either way (no nullable dtypes), so
+# .to_numpy() stays a plain float array.
+# =============================================================================
+    try:
+        return pd.read_csv(path, engine="pyarrow", **kwargs)
+    except (ImportError, ValueError):
+        return pd.read_csv(path, **kwargs)